@@ -4,12 +4,39 @@
 使用 HTTP 请求直接获取数据，更稳定可靠
 """
 
+import random
+import time
 import requests
 import json
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+# 可重试的 HTTP 状态码（限流与服务端临时错误）
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def get_with_retry(url, max_retries=5, **kwargs):
+    """带指数退避重试的 requests.get，遇到限流/5xx/网络异常时自动重试"""
+    for attempt in range(max_retries + 1):
+        try:
+            response = requests.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+            response = None
+
+        if response is not None and (response.status_code not in RETRY_STATUS or attempt == max_retries):
+            return response
+
+        delay = min(60, 2 ** attempt + random.random())
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = min(60, int(retry_after))
+        print(f"请求失败，{delay:.1f} 秒后重试（第 {attempt + 1}/{max_retries} 次）...")
+        time.sleep(delay)
+
+
 class ChiNextAnalyzer:
     def __init__(self):
         self.data = []
@@ -35,7 +62,7 @@ class ChiNextAnalyzer:
             }
 
             print(f"正在访问创业板数据API...")
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
+            response = get_with_retry(url, params=params, headers=self.headers, timeout=10)
 
             if response.status_code == 200:
                 json_data = response.json()
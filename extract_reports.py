@@ -4,9 +4,12 @@
 提取分析报告中的内容
 """
 
+import itertools
 import os
 import json
 from docx import Document
+from docx.table import Table
+from docx.text.paragraph import Paragraph
 import PyPDF2
 
 def extract_docx(file_path):
@@ -14,17 +17,27 @@ def extract_docx(file_path):
     try:
         doc = Document(file_path)
         text = []
-        for para in doc.paragraphs:
-            if para.text.strip():
-                text.append(para.text.strip())
+        table_text = []
 
-        # 也提取表格内容
-        for table in doc.tables:
-            for row in table.rows:
-                row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
-                if row_text:
-                    text.append(" | ".join(row_text))
+        # 单次遍历正文块，段落与表格按出现顺序逐个产出，不再预先构建全部对象
+        # iter_inner_content 需要 python-docx>=1.0，旧版本退回先段落后表格的遍历
+        if hasattr(doc, 'iter_inner_content'):
+            blocks = doc.iter_inner_content()
+        else:
+            blocks = itertools.chain(doc.paragraphs, doc.tables)
+        for block in blocks:
+            if isinstance(block, Paragraph):
+                para_text = block.text.strip()
+                if para_text:
+                    text.append(para_text)
+            elif isinstance(block, Table):
+                # 表格内容仍统一追加在段落之后
+                for row in block.rows:
+                    row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+                    if row_text:
+                        table_text.append(" | ".join(row_text))
 
+        text.extend(table_text)
         return "\n".join(text)
     except Exception as e:
         return f"Error reading {file_path}: {str(e)}"
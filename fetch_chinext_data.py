@@ -4,37 +4,221 @@
 使用 Playwright 抓取实时和历史数据
 """
 
+import argparse
 import asyncio
-import json
+import importlib.util
+import io
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
 from playwright.async_api import async_playwright
 import pandas as pd
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    # numba 为可选依赖，未安装时退化为纯 Python 循环
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, nogil=True)
+def _wilder_rsi(close, period, out):
+    """Wilder 平滑 RSI：首个均值取前 period 个涨跌幅的简单平均，之后递推平滑
+
+    非有限值（NaN/inf）的涨跌幅不参与计算，均值沿用上一值；对应收盘价缺失处输出 NaN。
+    """
+    n = close.shape[0]
+    out[:] = np.nan
+    avg_gain = 0.0
+    avg_loss = 0.0
+    count = 0
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        if np.isfinite(delta):
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if count < period:
+                avg_gain += gain
+                avg_loss += loss
+                count += 1
+                if count == period:
+                    avg_gain /= period
+                    avg_loss /= period
+            else:
+                avg_gain = (avg_gain * (period - 1) + gain) / period
+                avg_loss = (avg_loss * (period - 1) + loss) / period
+        if count < period or not np.isfinite(close[i]):
+            continue
+        if avg_loss == 0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True, nogil=True)
+def _ewm_step(weighted, old_wt, x, alpha):
+    """按 pandas ewm(adjust=False) 的规则推进一步；x 为 NaN 时沿用上一值"""
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if x == x:
+            if weighted != x:
+                weighted = (old_wt * weighted + alpha * x) / (old_wt + alpha)
+            old_wt = 1.0
+    elif x == x:
+        weighted = x
+    return weighted, old_wt
+
+
+@njit(cache=True, nogil=True)
+def _fused_indicators(close, periods, bb_period, bb_k, a_fast, a_slow, a_sig,
+                      with_macd, with_bb, out_ma, out_macd, out_sig, out_hist,
+                      out_bbm, out_bbs, out_bbu, out_bbl):
+    """单次遍历 close，同步更新均线滚动和、布林带平方和以及 MACD 的三条 EMA
+
+    periods 为空时不计算均线，with_macd / with_bb 为 False 时跳过对应指标（其输出数组不会被写入）。
+
+    NaN 收盘价不计入滚动和：窗口内含 NaN 时输出 NaN，移出窗口后恢复（同 pandas rolling）；
+    EMA 遇 NaN 沿用上一值（同 pandas ewm）。
+    """
+    n = close.shape[0]
+    m = periods.shape[0]
+    sums = np.zeros(m)
+    nans = np.zeros(m, dtype=np.int64)
+    # 以首个有效收盘价为基准平移，减小平方和相减时的精度损失
+    shift = 0.0
+    for i in range(n):
+        if np.isfinite(close[i]):
+            shift = close[i]
+            break
+    bb_sum = 0.0
+    bb_sumsq = 0.0
+    bb_nans = 0
+    ema_fast, w_fast = np.nan, 1.0
+    ema_slow, w_slow = np.nan, 1.0
+    ema_sig, w_sig = np.nan, 1.0
+    for i in range(n):
+        x = close[i]
+        valid = np.isfinite(x)
+
+        for k in range(m):
+            p = periods[k]
+            if valid:
+                sums[k] += x
+            else:
+                nans[k] += 1
+            if i >= p:
+                old = close[i - p]
+                if np.isfinite(old):
+                    sums[k] -= old
+                else:
+                    nans[k] -= 1
+            out_ma[k, i] = sums[k] / p if i >= p - 1 and nans[k] == 0 else np.nan
+
+        if with_macd:
+            ema_fast, w_fast = _ewm_step(ema_fast, w_fast, x if valid else np.nan, a_fast)
+            ema_slow, w_slow = _ewm_step(ema_slow, w_slow, x if valid else np.nan, a_slow)
+            macd = ema_fast - ema_slow
+            ema_sig, w_sig = _ewm_step(ema_sig, w_sig, macd, a_sig)
+            out_macd[i] = macd
+            out_sig[i] = ema_sig
+            out_hist[i] = macd - ema_sig
+
+        if not with_bb:
+            continue
+        if valid:
+            d = x - shift
+            bb_sum += d
+            bb_sumsq += d * d
+        else:
+            bb_nans += 1
+        if i >= bb_period:
+            old = close[i - bb_period]
+            if np.isfinite(old):
+                old -= shift
+                bb_sum -= old
+                bb_sumsq -= old * old
+            else:
+                bb_nans -= 1
+        if i >= bb_period - 1 and bb_nans == 0:
+            mean = bb_sum / bb_period
+            if bb_period > 1:
+                var = (bb_sumsq - bb_sum * mean) / (bb_period - 1)
+                std = np.sqrt(var) if var > 0 else 0.0
+            else:
+                # 单点窗口的样本标准差无定义，与 pandas rolling(1).std() 一致输出 NaN
+                std = np.nan
+            out_bbm[i] = mean + shift
+            out_bbs[i] = std
+            out_bbu[i] = mean + shift + bb_k * std
+            out_bbl[i] = mean + shift - bb_k * std
+        else:
+            out_bbm[i] = np.nan
+            out_bbs[i] = np.nan
+            out_bbu[i] = np.nan
+            out_bbl[i] = np.nan
+
+
+def _fused_columns(close, periods=(5, 10, 20, 30, 60), fast=12, slow=26, signal=9,
+                   bb_period=20, std_dev=2, macd=True, bb=True):
+    """调用融合内核，返回 列名 -> 数组 的映射，供各指标方法共用
+
+    只计算 periods 中的均线以及 macd / bb 为 True 的指标，未请求的部分不参与遍历。
+    """
+    n = len(close)
+    m_macd = n if macd else 0
+    m_bb = n if bb else 0
+    out_ma = np.empty((len(periods), n))
+    out_macd, out_sig, out_hist = np.empty(m_macd), np.empty(m_macd), np.empty(m_macd)
+    bbm, bbs, bbu, bbl = np.empty(m_bb), np.empty(m_bb), np.empty(m_bb), np.empty(m_bb)
+    _fused_indicators(close, np.asarray(periods, dtype=np.int64), bb_period, float(std_dev),
+                      2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1), macd, bb,
+                      out_ma, out_macd, out_sig, out_hist, bbm, bbs, bbu, bbl)
+    cols = {f'MA{period}': out_ma[k] for k, period in enumerate(periods)}
+    if macd:
+        cols.update({'MACD': out_macd, 'Signal': out_sig, 'Histogram': out_hist})
+    if bb:
+        cols.update({'BB_Middle': bbm, 'BB_Std': bbs, 'BB_Upper': bbu, 'BB_Lower': bbl})
+    return cols
+
+
+def has_parquet_engine():
+    """检查是否安装了 pandas 可用的 Parquet 引擎（pyarrow 或 fastparquet）"""
+    return any(importlib.util.find_spec(name) is not None for name in ('pyarrow', 'fastparquet'))
+
+
+KLINE_COLUMNS = ['date', 'open', 'close', 'high', 'low', 'volume', 'amount',
+                 'amplitude', 'change_pct', 'change', 'turnover']
+KLINE_REQUIRED_COLUMNS = ['open', 'close', 'high', 'low', 'volume', 'amount']
+KLINE_OPTIONAL_COLUMNS = ['amplitude', 'change_pct', 'change', 'turnover']
+KLINE_DTYPES = {col: 'float64' for col in KLINE_COLUMNS[1:]}
+
+
 class ChiNextAnalyzer:
     def __init__(self):
-        self.data = []
+        self.data = pd.DataFrame(columns=KLINE_COLUMNS)
         self.base_url = "http://quote.eastmoney.com/zs399006.html"  # 创业板指数
+        self.user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
 
     async def fetch_data(self):
         """使用 Playwright 抓取创业板数据"""
         async with async_playwright() as p:
             print("正在启动浏览器...")
             browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+            # 页面与 API 请求共用同一个上下文；后续如需抓取多个指数/标的，
+            # 应复用该 ctx（ctx.new_page / ctx.request），而不是重新启动浏览器
+            ctx = await browser.new_context(user_agent=self.user_agent)
+            page = await ctx.new_page()
 
             try:
                 print(f"正在访问创业板页面: {self.base_url}")
+                # 访问行情页以建立会话（Cookie 与后续 API 请求共享）
                 await page.goto(self.base_url, wait_until='networkidle', timeout=30000)
 
-                # 等待页面加载
-                await page.wait_for_timeout(3000)
-
-                # 获取实时数据
-                print("正在提取实时数据...")
-                current_price = await page.locator('.price').first.inner_text() if await page.locator('.price').count() > 0 else "N/A"
-
                 # 尝试获取K线数据的API
                 # 东方财富的K线数据API
                 kline_url = "http://push2his.eastmoney.com/api/qt/stock/kline/get"
@@ -51,49 +235,29 @@ class ChiNextAnalyzer:
                 }
 
                 # 构建完整URL
-                param_str = '&'.join([f"{k}={v}" for k, v in params.items()])
-                full_kline_url = f"{kline_url}?{param_str}"
+                full_kline_url = f"{kline_url}?{urlencode(params, safe=',')}"
 
+                # 直接通过浏览器上下文发起 HTTP 请求，无需再打开页面渲染 JSON
                 print(f"正在访问K线数据API...")
-                api_page = await browser.new_page()
-                await api_page.goto(full_kline_url)
-
-                # 获取API返回的JSON数据
-                content = await api_page.content()
-
-                # 解析JSON数据
-                import re
-                json_match = re.search(r'<pre[^>]*>(.*?)</pre>', content, re.DOTALL)
-                if json_match:
-                    json_data = json.loads(json_match.group(1))
+                resp = await ctx.request.get(full_kline_url, timeout=30000)
+                if not resp.ok:
+                    print(f"警告：API请求失败，状态码: {resp.status}")
+                else:
+                    json_data = await resp.json()
 
                     if json_data.get('data') and json_data['data'].get('klines'):
                         klines = json_data['data']['klines']
 
                         print(f"成功获取 {len(klines)} 条K线数据")
 
-                        for kline in klines:
-                            parts = kline.split(',')
-                            if len(parts) >= 11:
-                                self.data.append({
-                                    'date': parts[0],
-                                    'open': float(parts[1]),
-                                    'close': float(parts[2]),
-                                    'high': float(parts[3]),
-                                    'low': float(parts[4]),
-                                    'volume': float(parts[5]),
-                                    'amount': float(parts[6]),
-                                    'amplitude': float(parts[7]) if parts[7] else 0,
-                                    'change_pct': float(parts[8]) if parts[8] else 0,
-                                    'change': float(parts[9]) if parts[9] else 0,
-                                    'turnover': float(parts[10]) if parts[10] else 0
-                                })
+                        # 一次 C 级解析得到带类型的列；丢弃必填字段缺失的残缺行，可选字段空值按 0 处理
+                        df = pd.read_csv(io.StringIO('\n'.join(klines)), header=None,
+                                         names=KLINE_COLUMNS, dtype=KLINE_DTYPES)
+                        df = df.dropna(subset=KLINE_REQUIRED_COLUMNS).reset_index(drop=True)
+                        df[KLINE_OPTIONAL_COLUMNS] = df[KLINE_OPTIONAL_COLUMNS].fillna(0)
+                        self.data = df
                     else:
                         print("警告：API返回数据格式不正确")
-                else:
-                    print("警告：无法解析API返回数据")
-
-                await api_page.close()
 
             except Exception as e:
                 print(f"抓取数据时发生错误: {e}")
@@ -104,80 +268,95 @@ class ChiNextAnalyzer:
 
         return self.data
 
+    def save_to_parquet(self, filename='chinext_data.parquet'):
+        """保存数据到Parquet文件（zstd 压缩，需安装 pyarrow）"""
+        if self.data.empty:
+            print("没有数据可保存")
+            return
+
+        df = self.data
+        df.to_parquet(filename, index=False, compression='zstd')
+        print(f"数据已保存到 {filename}")
+        return df
+
     def save_to_csv(self, filename='chinext_data.csv'):
         """保存数据到CSV文件"""
-        if not self.data:
+        if self.data.empty:
             print("没有数据可保存")
             return
 
-        df = pd.DataFrame(self.data)
+        df = self.data
         df.to_csv(filename, index=False, encoding='utf-8-sig')
         print(f"数据已保存到 {filename}")
         return df
 
+    def calculate_indicators(self, df, periods=[5, 10, 20, 30, 60], fast=12, slow=26,
+                             signal=9, bb_period=20, std_dev=2, rsi_period=14):
+        """计算均线、MACD、布林带和RSI，列名与各单项方法一致
+
+        均线/MACD/布林带由融合内核一次遍历完成，RSI 内核在另一线程中同时执行。
+        安装 numba 时内核释放 GIL，两者可真正并行；未安装时退化为纯 Python，
+        两个线程轮流持有 GIL，不会带来加速。
+        """
+        close = df['close'].to_numpy(np.float64)
+        rsi = np.empty(len(close))
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            fused = pool.submit(_fused_columns, close, periods, fast, slow, signal, bb_period, std_dev)
+            wilder = pool.submit(_wilder_rsi, close, rsi_period, rsi)
+            cols = fused.result()
+            wilder.result()
+
+        # 结果统一在主线程写回 DataFrame
+        for col, values in cols.items():
+            df[col] = values
+        df['RSI'] = rsi
+        return df
+
     def calculate_ma(self, df, periods=[5, 10, 20, 30, 60]):
         """计算移动平均线"""
-        for period in periods:
-            df[f'MA{period}'] = df['close'].rolling(window=period).mean()
+        cols = _fused_columns(df['close'].to_numpy(np.float64), periods=periods, macd=False, bb=False)
+        for col, values in cols.items():
+            df[col] = values
         return df
 
     def calculate_macd(self, df, fast=12, slow=26, signal=9):
         """计算MACD指标"""
-        exp1 = df['close'].ewm(span=fast, adjust=False).mean()
-        exp2 = df['close'].ewm(span=slow, adjust=False).mean()
-        df['MACD'] = exp1 - exp2
-        df['Signal'] = df['MACD'].ewm(span=signal, adjust=False).mean()
-        df['Histogram'] = df['MACD'] - df['Signal']
+        cols = _fused_columns(df['close'].to_numpy(np.float64), periods=(),
+                              fast=fast, slow=slow, signal=signal, bb=False)
+        for col, values in cols.items():
+            df[col] = values
         return df
 
     def calculate_rsi(self, df, period=14):
-        """计算RSI指标"""
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
+        """计算RSI指标（Wilder 平滑）"""
+        close = df['close'].to_numpy(np.float64)
+        out = np.empty(len(close))
+        _wilder_rsi(close, period, out)
+        df['RSI'] = out
         return df
 
     def calculate_bollinger_bands(self, df, period=20, std_dev=2):
         """计算布林带"""
-        df['BB_Middle'] = df['close'].rolling(window=period).mean()
-        df['BB_Std'] = df['close'].rolling(window=period).std()
-        df['BB_Upper'] = df['BB_Middle'] + (df['BB_Std'] * std_dev)
-        df['BB_Lower'] = df['BB_Middle'] - (df['BB_Std'] * std_dev)
+        cols = _fused_columns(df['close'].to_numpy(np.float64), periods=(),
+                              bb_period=period, std_dev=std_dev, macd=False)
+        for col, values in cols.items():
+            df[col] = values
         return df
 
     def analyze(self, df):
         """进行技术分析"""
-        print("\n" + "="*60)
-        print("创业板指数技术分析报告")
-        print("="*60)
+        rule = "=" * 60
+        header = f"\n{rule}\n创业板指数技术分析报告\n{rule}"
 
         if df.empty:
-            print("没有数据可分析")
+            print(f"{header}\n没有数据可分析")
             return
 
         # 最新数据
+        close = df['close'].to_numpy()
         latest = df.iloc[-1]
         prev = df.iloc[-2] if len(df) > 1 else latest
 
-        print(f"\n【基本信息】")
-        print(f"日期: {latest['date']}")
-        print(f"收盘价: {latest['close']:.2f}")
-        print(f"涨跌幅: {latest['change_pct']:.2f}%")
-        print(f"涨跌额: {latest['change']:.2f}")
-        print(f"成交量: {latest['volume']:.0f}")
-        print(f"成交额: {latest['amount']:.2f}亿")
-        print(f"振幅: {latest['amplitude']:.2f}%")
-
-        # 移动平均线分析
-        print(f"\n【均线系统】")
-        print(f"MA5:  {latest['MA5']:.2f}")
-        print(f"MA10: {latest['MA10']:.2f}")
-        print(f"MA20: {latest['MA20']:.2f}")
-        print(f"MA30: {latest['MA30']:.2f}")
-        print(f"MA60: {latest['MA60']:.2f}")
-
         # 判断均线趋势
         if latest['close'] > latest['MA5'] > latest['MA10'] > latest['MA20']:
             ma_trend = "多头排列 📈（强势上涨）"
@@ -185,14 +364,8 @@ class ChiNextAnalyzer:
             ma_trend = "空头排列 📉（弱势下跌）"
         else:
             ma_trend = "均线缠绕（震荡整理）"
-        print(f"均线形态: {ma_trend}")
 
         # MACD分析
-        print(f"\n【MACD指标】")
-        print(f"MACD: {latest['MACD']:.2f}")
-        print(f"Signal: {latest['Signal']:.2f}")
-        print(f"Histogram: {latest['Histogram']:.2f}")
-
         if latest['MACD'] > latest['Signal'] and prev['MACD'] <= prev['Signal']:
             macd_signal = "金叉 🟢（买入信号）"
         elif latest['MACD'] < latest['Signal'] and prev['MACD'] >= prev['Signal']:
@@ -201,12 +374,8 @@ class ChiNextAnalyzer:
             macd_signal = "多头（看涨）"
         else:
             macd_signal = "空头（看跌）"
-        print(f"MACD信号: {macd_signal}")
 
         # RSI分析
-        print(f"\n【RSI指标】")
-        print(f"RSI(14): {latest['RSI']:.2f}")
-
         if latest['RSI'] > 70:
             rsi_signal = "超买区域 ⚠️（可能回调）"
         elif latest['RSI'] < 30:
@@ -215,16 +384,9 @@ class ChiNextAnalyzer:
             rsi_signal = "强势区域（偏多）"
         else:
             rsi_signal = "弱势区域（偏空）"
-        print(f"RSI状态: {rsi_signal}")
 
         # 布林带分析
-        print(f"\n【布林带】")
-        print(f"上轨: {latest['BB_Upper']:.2f}")
-        print(f"中轨: {latest['BB_Middle']:.2f}")
-        print(f"下轨: {latest['BB_Lower']:.2f}")
-
         bb_position = (latest['close'] - latest['BB_Lower']) / (latest['BB_Upper'] - latest['BB_Lower']) * 100
-        print(f"当前位置: {bb_position:.1f}%（0%=下轨，100%=上轨）")
 
         if latest['close'] > latest['BB_Upper']:
             bb_signal = "突破上轨（超买，注意回调风险）"
@@ -234,19 +396,16 @@ class ChiNextAnalyzer:
             bb_signal = "上半部（偏强）"
         else:
             bb_signal = "下半部（偏弱）"
-        print(f"布林带信号: {bb_signal}")
-
-        # 综合分析
-        print(f"\n【综合研判】")
 
         # 计算近期表现
-        if len(df) >= 5:
-            week_change = ((latest['close'] - df.iloc[-5]['close']) / df.iloc[-5]['close']) * 100
-            print(f"近5日涨跌: {week_change:.2f}%")
+        recent = ""
+        if len(close) >= 5:
+            week_change = ((close[-1] - close[-5]) / close[-5]) * 100
+            recent += f"\n近5日涨跌: {week_change:.2f}%"
 
-        if len(df) >= 20:
-            month_change = ((latest['close'] - df.iloc[-20]['close']) / df.iloc[-20]['close']) * 100
-            print(f"近20日涨跌: {month_change:.2f}%")
+        if len(close) >= 20:
+            month_change = ((close[-1] - close[-20]) / close[-20]) * 100
+            recent += f"\n近20日涨跌: {month_change:.2f}%"
 
         # 综合评分（简单示例）
         score = 0
@@ -272,9 +431,6 @@ class ChiNextAnalyzer:
             score += 1
             signals.append("RSI处于健康区间")
 
-        print(f"\n多头信号: {signals}")
-        print(f"技术强度: {score}/4.5 分")
-
         if score >= 3.5:
             overall = "强势多头 🚀 建议：关注回调买入机会"
         elif score >= 2.5:
@@ -284,39 +440,92 @@ class ChiNextAnalyzer:
         else:
             overall = "偏空格局 📉 建议：规避风险"
 
-        print(f"综合研判: {overall}")
-
-        print("\n" + "="*60)
-        print("注意：以上分析仅供参考，投资有风险，入市需谨慎！")
-        print("="*60 + "\n")
+        # 整份报告拼成一个字符串，一次输出
+        report = f"""{header}
+
+【基本信息】
+日期: {latest['date']}
+收盘价: {latest['close']:.2f}
+涨跌幅: {latest['change_pct']:.2f}%
+涨跌额: {latest['change']:.2f}
+成交量: {latest['volume']:.0f}
+成交额: {latest['amount']:.2f}亿
+振幅: {latest['amplitude']:.2f}%
+
+【均线系统】
+MA5:  {latest['MA5']:.2f}
+MA10: {latest['MA10']:.2f}
+MA20: {latest['MA20']:.2f}
+MA30: {latest['MA30']:.2f}
+MA60: {latest['MA60']:.2f}
+均线形态: {ma_trend}
+
+【MACD指标】
+MACD: {latest['MACD']:.2f}
+Signal: {latest['Signal']:.2f}
+Histogram: {latest['Histogram']:.2f}
+MACD信号: {macd_signal}
+
+【RSI指标】
+RSI(14): {latest['RSI']:.2f}
+RSI状态: {rsi_signal}
+
+【布林带】
+上轨: {latest['BB_Upper']:.2f}
+中轨: {latest['BB_Middle']:.2f}
+下轨: {latest['BB_Lower']:.2f}
+当前位置: {bb_position:.1f}%（0%=下轨，100%=上轨）
+布林带信号: {bb_signal}
+
+【综合研判】{recent}
+
+多头信号: {signals}
+技术强度: {score}/4.5 分
+综合研判: {overall}
+
+{rule}
+注意：以上分析仅供参考，投资有风险，入市需谨慎！
+{rule}
+"""
+        print(report)
 
-async def main():
+async def main(use_csv=False):
     analyzer = ChiNextAnalyzer()
 
+    # 抓取前先确认 Parquet 引擎可用，避免抓取完成后才因缺少依赖而无法保存
+    if not use_csv and not has_parquet_engine():
+        print("未安装 pyarrow，改为导出 CSV（pip3 install pyarrow 后可使用 Parquet）")
+        use_csv = True
+
     # 抓取数据
     print("开始抓取创业板数据...")
     data = await analyzer.fetch_data()
 
-    if not data:
+    if data.empty:
         print("未能获取数据，请检查网络连接")
         return
 
-    # 保存原始数据
-    df = analyzer.save_to_csv()
+    # 保存原始数据（默认 Parquet，--csv 时导出 CSV）
+    df = analyzer.save_to_csv() if use_csv else analyzer.save_to_parquet()
 
     # 计算技术指标
     print("\n正在计算技术指标...")
-    df = analyzer.calculate_ma(df)
-    df = analyzer.calculate_macd(df)
-    df = analyzer.calculate_rsi(df)
-    df = analyzer.calculate_bollinger_bands(df)
+    df = analyzer.calculate_indicators(df)
 
     # 保存带指标的数据
-    df.to_csv('chinext_analysis.csv', index=False, encoding='utf-8-sig')
-    print("分析数据已保存到 chinext_analysis.csv")
+    if use_csv:
+        analysis_file = 'chinext_analysis.csv'
+        df.to_csv(analysis_file, index=False, encoding='utf-8-sig')
+    else:
+        analysis_file = 'chinext_analysis.parquet'
+        df.to_parquet(analysis_file, index=False, compression='zstd')
+    print(f"分析数据已保存到 {analysis_file}")
 
     # 进行技术分析
     analyzer.analyze(df)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="创业板数据抓取和技术分析（Playwright 版本）")
+    parser.add_argument('--csv', action='store_true', help="以 CSV 格式导出数据（默认导出 Parquet）")
+    args = parser.parse_args()
+    asyncio.run(main(use_csv=args.csv))
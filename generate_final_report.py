@@ -4,71 +4,139 @@
 生成最终的投资分析报告（Markdown格式）
 """
 
+import functools
+import heapq
 import json
+import os
+import re
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import datetime
 
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick 为可选依赖，未安装时逐个名称扫描
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+# 任意中文字符；不含中文的文本不可能命中下面两种股票名称匹配
+_HAS_CJK = re.compile(r'[\u4e00-\u9fa5]')
+
+# 公司名(代码) 格式，兼容全角括号
+_CN_CODE_RE = re.compile(r'([\u4e00-\u9fa5]{2,10})\s*[\(（]\s*([036]\d{5})\s*[\)）]')
+
+# 知名股票名称 -> 代码
+KNOWN_STOCKS = {
+    "宁德时代": "300750",
+    "比亚迪": "002594",
+    "药明康德": "603259",
+    "凯莱英": "002821",
+    "康龙化成": "300759",
+    "泰格医药": "300347",
+    "阳光电源": "300274",
+    "隆基绿能": "601012",
+    "通威股份": "600438",
+    "美团": "HK03690",
+    "贵州茅台": "600519",
+    "五粮液": "000858",
+    "中国平安": "601318",
+    "招商银行": "600036",
+}
+_KNOWN = list(KNOWN_STOCKS.items())
+
+# 评级阈值表：bisect_right 落在第 k 档即取第 k 个结果
+_RATING_THRESH = (50, 60, 70, 80, 90)
+_RATING_VAL = ("D", "C", "B", "B+", "A", "A+")
+_STAR_THRESH = (5, 10, 15, 20)
+_STAR_VAL = ("⭐", "⭐⭐", "⭐⭐⭐", "⭐⭐⭐⭐", "⭐⭐⭐⭐⭐")
+_SUGGESTION = {"高": "重点关注", "中": "适度配置"}
+
+def _build_known_automaton():
+    """构建知名股票名称的 Aho-Corasick 自动机，一次扫描即可找出全部名称"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for name, code in _KNOWN:
+        automaton.add_word(name, (name, code))
+    automaton.make_automaton()
+    return automaton
+
+_KNOWN_AUTOMATON = _build_known_automaton()
+
+def _iter_known_stocks(content):
+    """逐次产出文本中出现的知名股票 (名称, 代码, 次数)"""
+    if _KNOWN_AUTOMATON is None:
+        for name, code in _KNOWN:
+            cnt = content.count(name)
+            if cnt:
+                yield name, code, cnt
+        return
+
+    counts = {}
+    for _, name_code in _KNOWN_AUTOMATON.iter(content):
+        counts[name_code] = counts.get(name_code, 0) + 1
+    # 按 _KNOWN 原顺序产出，保证同分股票的排序与逐个扫描时一致
+    for name_code in _KNOWN:
+        cnt = counts.get(name_code)
+        if cnt:
+            yield name_code[0], name_code[1], cnt
+
+def _load_json(path):
+    """读取 JSON 文件，优先使用 orjson 解析"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+@functools.lru_cache(maxsize=1)
 def load_data():
-    """加载分析数据"""
-    with open('/home/user/automate-system/analysis_result.json', 'r', encoding='utf-8') as f:
-        analysis = json.load(f)
-
-    with open('/home/user/automate-system/extracted_reports.json', 'r', encoding='utf-8') as f:
-        reports = json.load(f)
+    """加载分析数据（结果会被缓存，重复调用不再重新解析）"""
+    analysis = _load_json('/home/user/automate-system/analysis_result.json')
+    reports = _load_json('/home/user/automate-system/extracted_reports.json')
 
     return analysis, reports
 
 def extract_key_stocks_from_text(reports):
     """从文本中提取提及的股票名称"""
-    import re
-
-    # 常见的股票名称模式
-    stock_patterns = [
-        r'([\u4e00-\u9fa5]{2,6})\s*\(\s*([036]\d{5})\s*\)',  # 公司名(代码)
-        r'([036]\d{5})\s*\.\s*(SH|SZ)',  # 代码.SH/SZ
-    ]
-
-    stocks_found = {}
+    stocks_found = defaultdict(lambda: {"name": None, "mentions": 0, "reports": set()})
 
     for filename, data in reports.items():
         content = data['content']
+        if not _HAS_CJK.search(content):
+            continue
 
         # 方法1：匹配 "公司名(代码)" 格式
-        matches = re.findall(r'([\u4e00-\u9fa5]{2,10})\s*[\(（]\s*([036]\d{5})\s*[\)）]', content)
-        for name, code in matches:
-            if code not in stocks_found:
-                stocks_found[code] = {"name": name, "mentions": 0, "reports": set()}
-            stocks_found[code]["mentions"] += 1
-            stocks_found[code]["reports"].add(filename)
+        for name, code in _CN_CODE_RE.findall(content):
+            entry = stocks_found[code]
+            if entry["name"] is None:
+                entry["name"] = name
+            entry["mentions"] += 1
+            entry["reports"].add(filename)
 
         # 方法2：直接查找知名股票名称
-        known_stocks = {
-            "宁德时代": "300750",
-            "比亚迪": "002594",
-            "药明康德": "603259",
-            "凯莱英": "002821",
-            "康龙化成": "300759",
-            "泰格医药": "300347",
-            "阳光电源": "300274",
-            "隆基绿能": "601012",
-            "通威股份": "600438",
-            "美团": "HK03690",
-            "贵州茅台": "600519",
-            "五粮液": "000858",
-            "中国平安": "601318",
-            "招商银行": "600036",
-        }
-
-        for name, code in known_stocks.items():
-            if name in content:
-                if code not in stocks_found:
-                    stocks_found[code] = {"name": name, "mentions": 0, "reports": set()}
-                stocks_found[code]["mentions"] += content.count(name)
-                stocks_found[code]["reports"].add(filename)
-
-    return stocks_found
+        for name, code, cnt in _iter_known_stocks(content):
+            entry = stocks_found[code]
+            if entry["name"] is None:
+                entry["name"] = name
+            entry["mentions"] += cnt
+            entry["reports"].add(filename)
+
+    return dict(stocks_found)
 
 def generate_markdown_report(analysis, reports):
     """生成Markdown格式的报告"""
+    meta = analysis['metadata']
+    total = meta['total_reports']
+    total_suffix = f"/{total}"
+    rankings = analysis['sector_analysis']['rankings']
+    cross = analysis['cross_validation']
 
     md = []
     md.append("# 📊 投资分析报告汇总")
@@ -77,42 +145,48 @@ def generate_markdown_report(analysis, reports):
 
     # 1. 概览
     md.append("## 一、分析概览\n")
-    md.append(f"- **分析报告数量**: {analysis['metadata']['total_reports']} 份")
-    md.append(f"- **识别板块数量**: {analysis['metadata']['total_sectors']} 个")
+    md.append(f"- **分析报告数量**: {total} 份")
+    md.append(f"- **识别板块数量**: {meta['total_sectors']} 个")
     md.append(f"- **时间跨度**: 2025年9月-11月\n")
 
     # 2. 板块分析
-    md.append("\n## 二、板块分析与评分（100分制）\n")
-    md.append("### 📈 板块评分排行榜\n")
-    md.append("| 排名 | 板块 | 综合评分 | 提及次数 | 报告覆盖率 | 情感分数 | 评级 |")
-    md.append("|------|------|---------|---------|-----------|---------|------|")
+    md.append("""
+## 二、板块分析与评分（100分制）
 
-    for item in analysis['sector_analysis']['rankings']:
-        coverage_pct = f"{item['coverage']}/{analysis['metadata']['total_reports']}"
+### 📈 板块评分排行榜
+
+| 排名 | 板块 | 综合评分 | 提及次数 | 报告覆盖率 | 情感分数 | 评级 |
+|------|------|---------|---------|-----------|---------|------|""")
+
+    for item in rankings:
+        coverage_pct = f"{item['coverage']}{total_suffix}"
         rating = get_rating(item['score'])
         md.append(f"| {item['rank']} | **{item['sector']}** | {item['score']} | "
                   f"{item['frequency']} | {coverage_pct} | {item['sentiment']:.2f} | {rating} |")
 
     # 评分说明
-    md.append("\n### 📝 评分说明\n")
-    md.append("**评分维度**:")
-    md.append("- **提及频率** (40分): 板块在所有报告中被提及的总次数")
-    md.append("- **报告覆盖度** (30分): 有多少份报告提及了该板块")
-    md.append("- **情感分数** (30分): 基于积极/消极词汇的情感倾向分析\n")
-
-    md.append("**评级标准**:")
-    md.append("- A+ (90-100分): 极力推荐")
-    md.append("- A (80-89分): 强烈推荐")
-    md.append("- B+ (70-79分): 推荐")
-    md.append("- B (60-69分): 关注")
-    md.append("- C (50-59分): 观望")
-    md.append("- D (50分以下): 谨慎\n")
+    md.append("""
+### 📝 评分说明
+
+**评分维度**:
+- **提及频率** (40分): 板块在所有报告中被提及的总次数
+- **报告覆盖度** (30分): 有多少份报告提及了该板块
+- **情感分数** (30分): 基于积极/消极词汇的情感倾向分析
+
+**评级标准**:
+- A+ (90-100分): 极力推荐
+- A (80-89分): 强烈推荐
+- B+ (70-79分): 推荐
+- B (60-69分): 关注
+- C (50-59分): 观望
+- D (50分以下): 谨慎
+""")
 
     # 3. 核心投资逻辑
     md.append("\n## 三、核心选股逻辑总结\n")
 
     # 分板块总结
-    top_sectors = analysis['sector_analysis']['rankings'][:5]
+    top_sectors = rankings[:5]
 
     md.append("### 🎯 Top 5 板块投资逻辑\n")
 
@@ -167,34 +241,41 @@ def generate_markdown_report(analysis, reports):
             md.append(f"- 市场情感倾向: {'积极' if item['sentiment'] > 0.2 else '中性' if item['sentiment'] > 0 else '谨慎'}")
 
     # 4. 观点一致性分析
-    md.append("\n\n## 四、观点交叉验证\n")
-    md.append("### 🔍 多份报告观点一致性分析\n")
-    md.append("| 板块 | 共识度 | 提及报告数 | 可信度等级 | 建议 |")
-    md.append("|------|--------|-----------|-----------|------|")
+    md.append("""
+
+## 四、观点交叉验证
+
+### 🔍 多份报告观点一致性分析
 
-    for sector, data in analysis['cross_validation'].items():
+| 板块 | 共识度 | 提及报告数 | 可信度等级 | 建议 |
+|------|--------|-----------|-----------|------|""")
+
+    for sector, data in cross.items():
         suggestion = get_suggestion(data['consensus_rate'], data['confidence_level'])
         md.append(f"| {sector} | {data['consensus_rate']}% | "
-                  f"{data['reports_count']}/{analysis['metadata']['total_reports']} | "
+                  f"{data['reports_count']}{total_suffix} | "
                   f"{data['confidence_level']} | {suggestion} |")
 
-    md.append("\n**说明**: ")
-    md.append("- **共识度**: 该板块在所有报告中被提及的比例")
-    md.append("- **可信度**: 基于共识度的可信度评级（高>50%, 中30-50%, 低<30%）\n")
+    md.append("""
+**说明**: 
+- **共识度**: 该板块在所有报告中被提及的比例
+- **可信度**: 基于共识度的可信度评级（高>50%, 中30-50%, 低<30%）
+""")
 
     # 5. 股票池
     md.append("\n## 五、重点关注股票\n")
 
     # 提取股票
     stocks = extract_key_stocks_from_text(reports)
-    sorted_stocks = sorted(stocks.items(), key=lambda x: x[1]['mentions'], reverse=True)
+    sorted_stocks = heapq.nlargest(20, stocks.items(), key=lambda kv: kv[1]['mentions'])
 
     if sorted_stocks:
-        md.append("### 📌 高频提及股票\n")
-        md.append("| 排名 | 股票代码 | 股票名称 | 提及次数 | 覆盖报告数 | 推荐度 |")
-        md.append("|------|---------|---------|---------|-----------|--------|")
+        md.append("""### 📌 高频提及股票
+
+| 排名 | 股票代码 | 股票名称 | 提及次数 | 覆盖报告数 | 推荐度 |
+|------|---------|---------|---------|-----------|--------|""")
 
-        for i, (code, data) in enumerate(sorted_stocks[:20], 1):
+        for i, (code, data) in enumerate(sorted_stocks, 1):
             name = data.get('name', '未知')
             mentions = data['mentions']
             coverage = len(data['reports'])
@@ -206,13 +287,13 @@ def generate_markdown_report(analysis, reports):
     # 6. 投资建议
     md.append("\n## 六、综合投资建议\n")
 
-    top3_sectors = [item['sector'] for item in analysis['sector_analysis']['rankings'][:3]]
+    top3_sectors = [item['sector'] for item in rankings[:3]]
 
     md.append("### ✅ 配置建议\n")
     md.append(f"**核心配置** (60-70%): {', '.join(top3_sectors)}")
     md.append(f"- 这些板块获得最高评分和共识度，建议重点配置\n")
 
-    mid_sectors = [item['sector'] for item in analysis['sector_analysis']['rankings'][3:6]]
+    mid_sectors = [item['sector'] for item in rankings[3:6]]
     md.append(f"**卫星配置** (20-30%): {', '.join(mid_sectors)}")
     md.append(f"- 这些板块有一定关注度，可作为组合补充\n")
 
@@ -220,17 +301,22 @@ def generate_markdown_report(analysis, reports):
     md.append(f"- 根据市场变化和最新信息调整\n")
 
     # 7. 风险提示
-    md.append("\n### ⚠️ 风险提示\n")
-    md.append("1. 本分析基于历史报告，不构成投资建议")
-    md.append("2. 市场环境快速变化，需结合最新信息判断")
-    md.append("3. 板块轮动频繁，注意仓位控制和风险管理")
-    md.append("4. 个股选择需进一步研究基本面和技术面")
-    md.append("5. 建议分散投资，避免过度集中单一板块\n")
+    md.append("""
+### ⚠️ 风险提示
+
+1. 本分析基于历史报告，不构成投资建议
+2. 市场环境快速变化，需结合最新信息判断
+3. 板块轮动频繁，注意仓位控制和风险管理
+4. 个股选择需进一步研究基本面和技术面
+5. 建议分散投资，避免过度集中单一板块
+""")
 
     # 8. 附录
-    md.append("\n## 附录：分析报告清单\n")
-    md.append("| 序号 | 报告名称 | 字符数 |")
-    md.append("|------|---------|--------|")
+    md.append("""
+## 附录：分析报告清单
+
+| 序号 | 报告名称 | 字符数 |
+|------|---------|--------|""")
 
     for i, (filename, data) in enumerate(sorted(reports.items()), 1):
         md.append(f"| {i} | {filename} | {data['length']:,} |")
@@ -242,42 +328,31 @@ def generate_markdown_report(analysis, reports):
 
 def get_rating(score):
     """根据分数返回评级"""
-    if score >= 90:
-        return "A+"
-    elif score >= 80:
-        return "A"
-    elif score >= 70:
-        return "B+"
-    elif score >= 60:
-        return "B"
-    elif score >= 50:
-        return "C"
-    else:
-        return "D"
+    return _RATING_VAL[bisect_right(_RATING_THRESH, score)]
 
 def get_suggestion(consensus_rate, confidence_level):
     """根据共识度给出建议"""
-    if confidence_level == "高":
-        return "重点关注"
-    elif confidence_level == "中":
-        return "适度配置"
-    else:
-        return "观望为主"
+    return _SUGGESTION.get(confidence_level, "观望为主")
 
 def get_stock_recommendation(mentions, coverage):
     """根据提及次数和覆盖度给出推荐度"""
     score = mentions * 2 + coverage * 5
-
-    if score >= 20:
-        return "⭐⭐⭐⭐⭐"
-    elif score >= 15:
-        return "⭐⭐⭐⭐"
-    elif score >= 10:
-        return "⭐⭐⭐"
-    elif score >= 5:
-        return "⭐⭐"
-    else:
-        return "⭐"
+    return _STAR_VAL[bisect_right(_STAR_THRESH, score)]
+
+def write_text_atomic(path, text):
+    """先写临时文件再 os.replace，避免中途崩溃留下不完整的报告"""
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        # 写入或替换失败时清理临时文件，不留残余
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        raise
 
 def main():
     print("生成最终报告...")
@@ -287,16 +362,14 @@ def main():
 
     # 保存报告
     output_file = "/home/user/automate-system/投资分析总结报告.md"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(markdown_report)
+    write_text_atomic(output_file, markdown_report)
 
     print(f"✓ 报告已生成: {output_file}")
     print(f"✓ 报告长度: {len(markdown_report)} 字符\n")
 
     # 也保存纯文本版本
     txt_file = "/home/user/automate-system/投资分析总结报告.txt"
-    with open(txt_file, 'w', encoding='utf-8') as f:
-        f.write(markdown_report)
+    write_text_atomic(txt_file, markdown_report)
 
     print(f"✓ 纯文本版本: {txt_file}")
 